@@ -2,18 +2,63 @@ import streamlit as st
 import hashlib
 from web3 import Web3
 from eth_account import Account
+from eth_account.signers.local import LocalAccount
+from eth_utils import event_abi_to_log_topic
+from web3.datastructures import AttributeDict
+from web3._utils.method_formatters import receipt_formatter
 import json
 import time
 import os
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, List, Tuple
 import logging
+import ssl
+import functools
+import threading
+
+from signer_utils import (
+    hash_and_cid,
+    call_outputs,
+    decode_call_result,
+    batch_call,
+    NonceTracker,
+    is_nonce_too_low,
+    is_method_rejection,
+    created_contract_address,
+    SettledSigningState
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Multicall3 is deployed at the same address on most chains, including Sepolia
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+MULTICALL3_ABI = [{
+    'name': 'tryAggregate',
+    'type': 'function',
+    'stateMutability': 'payable',
+    'inputs': [
+        {'name': 'requireSuccess', 'type': 'bool'},
+        {'name': 'calls', 'type': 'tuple[]', 'components': [
+            {'name': 'target', 'type': 'address'},
+            {'name': 'callData', 'type': 'bytes'}
+        ]}
+    ],
+    'outputs': [
+        {'name': 'returnData', 'type': 'tuple[]', 'components': [
+            {'name': 'success', 'type': 'bool'},
+            {'name': 'returnData', 'type': 'bytes'}
+        ]}
+    ]
+}]
+
+# Signing status enum values of EnhancedDocumentSigner
+STATUS_NAMES = ["INITIATED", "IN_PROGRESS", "COMPLETED", "CANCELLED"]
+FINAL_STATUSES = ("COMPLETED", "CANCELLED")
+
 # Configuration Management
 class Config:
     def __init__(self):
@@ -35,6 +80,7 @@ class Config:
         
         # Contract addresses
         self.factory_address = os.getenv(f'FACTORY_ADDRESS_{self.environment.upper()}')
+        self.multicall_address = os.getenv('MULTICALL_ADDRESS') or MULTICALL3_ADDRESS
         
         # IPFS configuration
         self.nft_storage_key = os.getenv('NFT_STORAGE_API_KEY')
@@ -42,9 +88,30 @@ class Config:
 
 config = Config()
 
+RPC_TIMEOUT = 10  # Seconds
+SYNC_SEND_TIMEOUT_MS = (RPC_TIMEOUT - 2) * 1000  # Node-side wait for eth_sendRawTransactionSync
+
+@st.cache_resource
+def rpc_session() -> requests.Session:
+    """Keep-alive HTTP session reused by every RPC request, across reruns"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+@st.cache_resource
+def web3_client() -> Web3:
+    """Web3 client on the shared RPC session, built once per process"""
+    return Web3(Web3.HTTPProvider(
+        config.rpc_url,
+        session=rpc_session(),
+        request_kwargs={'timeout': RPC_TIMEOUT}
+    ))
+
 # Web3 setup with error handling
 try:
-    w3 = Web3(Web3.HTTPProvider(config.rpc_url))
+    w3 = web3_client()
     if not w3.is_connected():
         st.error(f"❌ Failed to connect to {config.environment} network")
         st.stop()
@@ -53,8 +120,9 @@ except Exception as e:
     st.stop()
 
 # Load contract ABIs
+@st.cache_resource(show_spinner=False)
 def load_contract_abi(contract_name: str) -> Optional[Dict]:
-    """Load contract ABI from artifacts or deployments"""
+    """Load contract ABI from artifacts or deployments (parsed once per process)"""
     try:
         # Try loading from Hardhat artifacts first
         artifacts_path = Path(f'artifacts/contracts/{contract_name}.sol/{contract_name}.json')
@@ -87,6 +155,9 @@ def load_contract_abi(contract_name: str) -> Optional[Dict]:
 FACTORY_ABI = load_contract_abi('DocumentSignerFactory')
 SIGNER_ABI = load_contract_abi('EnhancedDocumentSigner')
 
+if not FACTORY_ABI or not SIGNER_ABI:
+    load_contract_abi.clear()  # Don't keep a missing ABI cached; retry on the next run
+
 if not FACTORY_ABI:
     st.error("❌ Could not load DocumentSignerFactory ABI. Please compile contracts first.")
     st.stop()
@@ -95,26 +166,173 @@ if not SIGNER_ABI:
     st.error("❌ Could not load EnhancedDocumentSigner ABI. Please compile contracts first.")
     st.stop()
 
-# Utility functions
-def hash_document(file_bytes: bytes) -> str:
-    """Generate SHA-256 hash of document bytes"""
-    sha256 = hashlib.sha256()
-    sha256.update(file_bytes)
-    return '0x' + sha256.hexdigest()
-
-def upload_to_ipfs(file_bytes: bytes, filename: str) -> str:
-    """Upload file to IPFS via NFT.Storage (mock implementation)"""
-    # In a real implementation, you would upload to IPFS
-    # For now, return a mock CID
-    import hashlib
-    file_hash = hashlib.md5(file_bytes).hexdigest()
-    return f"Qm{file_hash[:44]}"  # Mock IPFS CID
+class ContractInstances:
+    """Contract instances bound to one Web3 client
+    
+    Building a contract processes its ABI, so these are kept for the whole
+    process by contract_instances() instead of being rebuilt on every rerun.
+    Signer contracts are built on first use, for at most 256 addresses.
+    """
+    
+    def __init__(self, w3: Web3, factory_abi: List[Dict], signer_abi: List[Dict]):
+        self.factory = (
+            w3.eth.contract(address=config.factory_address, abi=factory_abi)
+            if config.factory_address else None
+        )
+        self.create_signing_contract = (
+            self.factory.get_function_by_name('createSigningContract')
+            if self.factory else None
+        )
+        self.contract_created_topic = event_abi_to_log_topic(next(
+            item for item in factory_abi
+            if item['type'] == 'event' and item['name'] == 'ContractCreated'
+        ))
+        self.multicall = w3.eth.contract(address=config.multicall_address, abi=MULTICALL3_ABI)
+        self.signer = functools.lru_cache(maxsize=256)(
+            lambda contract_address: w3.eth.contract(address=contract_address, abi=signer_abi)
+        )
+
+@st.cache_resource
+def contract_instances() -> ContractInstances:
+    """Process-wide contract instances, bound to the shared Web3 client"""
+    return ContractInstances(w3, FACTORY_ABI, SIGNER_ABI)
+
+# Hashing backend check
+@st.cache_resource(show_spinner=False)
+def probe_hash_backend() -> Dict:
+    """Report whether SHA-256 runs on OpenSSL and if the CPU exposes SHA extensions (once per process)"""
+    # hashlib falls back to CPython's builtin (scalar) SHA-256 when built without OpenSSL
+    openssl_backed = hashlib.sha256.__name__.startswith('openssl_')
+    try:
+        sha_ni = 'sha_ni' in Path('/proc/cpuinfo').read_text().split()
+    except OSError:
+        sha_ni = None  # Not Linux, CPU flags unknown
+    
+    backend = {
+        'openssl_backed': openssl_backed,
+        'openssl_version': ssl.OPENSSL_VERSION,
+        'sha_ni': sha_ni
+    }
+    if not openssl_backed:
+        logger.warning("SHA-256 is not backed by OpenSSL; document hashing will use the slow builtin path")
+    elif sha_ni is False:
+        logger.warning(f"CPU does not expose SHA-NI; {ssl.OPENSSL_VERSION} will hash in software")
+    else:
+        logger.info(f"SHA-256 backend: {ssl.OPENSSL_VERSION} (SHA-NI: {'yes' if sha_ni else 'unknown'})")
+    return backend
+
+probe_hash_backend()
+
+@st.cache_resource(show_spinner=False)
+def multicall_available() -> bool:
+    """Check whether Multicall3 is deployed on the connected chain (once per process)"""
+    return len(w3.eth.get_code(contract_instances().multicall.address)) > 0
+
+def aggregate_calls(calls: List[Tuple]) -> List:
+    """Execute (contract, fn_name, args) read calls in one eth_call via Multicall3
+    
+    Failed calls yield None. Falls back to a JSON-RPC batch on chains without
+    Multicall3 (e.g. a local Hardhat node).
+    """
+    if not calls:
+        return []
+    if not multicall_available():
+        return batch_call(rpc_session(), config.rpc_url, calls, allow_failure=True, timeout=RPC_TIMEOUT)
+    
+    return_data = contract_instances().multicall.functions.tryAggregate(False, [
+        (contract.address, contract.encodeABI(fn_name=fn_name, args=args))
+        for contract, fn_name, args in calls
+    ]).call()
+    
+    results = []
+    for (contract, fn_name, args), outputs, (success, data) in zip(calls, call_outputs(calls), return_data):
+        try:
+            results.append(decode_call_result(outputs, data) if success else None)
+        except Exception as e:
+            logger.warning(f"Could not decode {fn_name} result from {contract.address}: {e}")
+            results.append(None)
+    return results
+
+@st.cache_resource
+def nonce_tracker() -> NonceTracker:
+    """Process-wide next-nonce tracker per sender address, shared across reruns"""
+    return NonceTracker(lambda address: w3.eth.get_transaction_count(address, 'pending'))
+
+@st.cache_resource
+def unsupported_rpc_methods() -> set:
+    """Optional RPC methods the node has rejected as unknown, remembered across reruns"""
+    return set()
+
+def send_raw_transaction_sync(signed_txn, timeout: float = 120):
+    """Send a signed transaction and return its receipt once mined
+    
+    Uses eth_sendRawTransactionSync where the node supports it, which returns on
+    inclusion instead of polling eth_getTransactionReceipt.
+    """
+    unsupported = unsupported_rpc_methods()
+    if 'eth_sendRawTransactionSync' not in unsupported:
+        raw_transaction = Web3.to_hex(signed_txn.rawTransaction)
+        try:
+            # Ask the node to give up before our HTTP request times out
+            response = w3.provider.make_request('eth_sendRawTransactionSync', [
+                raw_transaction,
+                SYNC_SEND_TIMEOUT_MS
+            ])
+            if (response.get('error') or {}).get('code') == -32602:
+                # Invalid params: the node may not accept the optional timeout, so try without it
+                response = w3.provider.make_request('eth_sendRawTransactionSync', [raw_transaction])
+        except requests.Timeout:
+            # The transaction may already be broadcast; wait for it instead of resending
+            logger.warning("eth_sendRawTransactionSync timed out; polling for the receipt")
+            return w3.eth.wait_for_transaction_receipt(signed_txn.hash, timeout=timeout)
+        
+        error = response.get('error')
+        if not error:
+            return AttributeDict.recursive(receipt_formatter(response['result']))
+        if error.get('code') == 4:
+            # Node gave up waiting for inclusion, but the transaction was sent
+            return w3.eth.wait_for_transaction_receipt(signed_txn.hash, timeout=timeout)
+        if not (is_method_rejection(error) or error.get('code') == -32602):
+            raise ValueError(f"Transaction failed: {error.get('message')}")
+        unsupported.add('eth_sendRawTransactionSync')
+        logger.info("Node does not support eth_sendRawTransactionSync; polling for receipts")
+    
+    tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+    return w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+
+def send_contract_transaction(contract_function, account, gas: int, sync: bool = False):
+    """Build, sign and send a contract function transaction
+    
+    Returns the transaction hash, or the mined receipt when sync is set. If the
+    node rejects the cached nonce as too low (e.g. the account also sent from
+    another wallet), the nonce is re-fetched and the transaction retried once.
+    """
+    nonces = nonce_tracker()
+    for attempt in range(2):
+        try:
+            txn = contract_function.build_transaction({
+                'from': account.address,
+                'nonce': nonces.next(account.address),
+                'gas': gas,
+                'gasPrice': w3.to_wei('20', 'gwei')
+            })
+            signed_txn = account.sign_transaction(txn)
+            if sync:
+                return send_raw_transaction_sync(signed_txn)
+            return w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            
+        except Exception as e:
+            # Nonce may now be stale or skipped; re-sync on next use
+            nonces.reset(account.address)
+            if attempt or not is_nonce_too_low(e):
+                raise
+            logger.warning(f"Nonce for {account.address} was behind the chain; retrying with a fresh nonce")
 
 def create_signing_contract(
     document_hash: str, 
     ipfs_cid: str,
     required_signers: List[str], 
-    private_key: str,
+    account: LocalAccount,
     title: str = "Document",
     description: str = "Document for signing",
     sequential_signing: bool = False
@@ -124,61 +342,46 @@ def create_signing_contract(
         if not config.factory_address:
             raise ValueError("Factory address not configured")
         
-        account = Account.from_key(private_key)
-        factory = w3.eth.contract(address=config.factory_address, abi=FACTORY_ABI)
+        instances = contract_instances()
         
-        # Build transaction
-        txn = factory.functions.createSigningContract(
-            document_hash,
-            ipfs_cid,
-            required_signers,
-            sequential_signing,
-            title,
-            description
-        ).build_transaction({
-            'from': account.address,
-            'nonce': w3.eth.get_transaction_count(account.address),
-            'gas': 3000000,
-            'gasPrice': w3.to_wei('20', 'gwei')
-        })
-        
-        # Sign and send transaction
-        signed_txn = w3.eth.account.sign_transaction(txn, private_key)
-        tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        # Build, sign and send transaction, waiting for it to be mined
+        tx_receipt = send_contract_transaction(
+            instances.create_signing_contract(
+                document_hash,
+                ipfs_cid,
+                required_signers,
+                sequential_signing,
+                title,
+                description
+            ),
+            account,
+            gas=3000000,
+            sync=True
+        )
         
         # Extract contract address from event logs
-        for log in tx_receipt.logs:
-            try:
-                decoded_log = factory.events.ContractCreated().processLog(log)
-                return decoded_log.args.contractAddress
-            except:
-                continue
-        
-        raise ValueError("Could not find ContractCreated event in transaction receipt")
+        contract_address = created_contract_address(
+            instances.factory, tx_receipt.logs, instances.contract_created_topic
+        )
+        if contract_address is None:
+            raise ValueError("Could not find ContractCreated event in transaction receipt")
+        return contract_address
         
     except Exception as e:
         logger.error(f"Error creating signing contract: {e}")
         raise
 
-def sign_document(contract_address: str, private_key: str, metadata: str = "") -> str:
+def sign_document(contract_address: str, account: LocalAccount, metadata: str = "") -> str:
     """Sign a document in the given contract"""
     try:
-        account = Account.from_key(private_key)
-        contract = w3.eth.contract(address=contract_address, abi=SIGNER_ABI)
-        
-        # Build transaction
-        txn = contract.functions.signDocument(metadata).build_transaction({
-            'from': account.address,
-            'nonce': w3.eth.get_transaction_count(account.address),
-            'gas': 200000,
-            'gasPrice': w3.to_wei('20', 'gwei')
-        })
+        contract = contract_instances().signer(contract_address)
         
-        # Sign and send transaction
-        signed_txn = w3.eth.account.sign_transaction(txn, private_key)
-        tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-        w3.eth.wait_for_transaction_receipt(tx_hash)
+        # Build, sign and send transaction; confirmation is left to confirm_transaction
+        tx_hash = send_contract_transaction(
+            contract.functions.signDocument(metadata),
+            account,
+            gas=200000
+        )
         
         return tx_hash.hex()
         
@@ -186,71 +389,226 @@ def sign_document(contract_address: str, private_key: str, metadata: str = "") -
         logger.error(f"Error signing document: {e}")
         raise
 
-def get_contract_status(contract_address: str) -> Dict:
-    """Get the status of a signing contract"""
+def confirm_transaction(tx_hash: str, sender_address: str, timeout: float = 120) -> bool:
+    """Wait for a transaction to be mined and report whether it succeeded"""
     try:
-        contract = w3.eth.contract(address=contract_address, abi=SIGNER_ABI)
+        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+        if tx_receipt.status != 1:
+            nonce_tracker().reset(sender_address)
+        return tx_receipt.status == 1
         
-        # Get contract information
-        signatures = contract.functions.getSignatures().call()
-        is_fully_signed = contract.functions.isFullySigned().call()
-        required_signers = contract.functions.getRequiredSigners().call()
-        progress = contract.functions.getSigningProgress().call()
-        status = contract.functions.status().call()
-        document_hash = contract.functions.documentHash().call()
-        ipfs_cid = contract.functions.ipfsCid().call()
+    except Exception as e:
+        # The transaction may have been dropped, leaving the cached nonce ahead of
+        # the chain; re-syncing from the 'pending' count is safe if it is just slow
+        nonce_tracker().reset(sender_address)
+        logger.error(f"Error confirming transaction {tx_hash}: {e}")
+        raise
+
+@st.cache_resource
+def settled_signing_state() -> SettledSigningState:
+    """Process-wide settled signing state, shared across reruns"""
+    return SettledSigningState()
+
+def fetch_contract_status(
+    contract_address: str,
+    session: Optional[requests.Session] = None,
+    settled_state: Optional[SettledSigningState] = None,
+    instances: Optional[ContractInstances] = None
+) -> Dict:
+    """Read the status of a signing contract from the chain"""
+    try:
+        contract = (instances or contract_instances()).signer(contract_address)
+        session = session or rpc_session()
+        settled_state = settled_state or settled_signing_state()
         
-        # Status mapping
-        status_names = ["INITIATED", "IN_PROGRESS", "COMPLETED", "CANCELLED"]
+        settled = settled_state.get(contract.address)
+        if settled:
+            document_hash, ipfs_cid = batch_call(session, config.rpc_url, [
+                (contract, 'documentHash', ()),
+                (contract, 'ipfsCid', ())
+            ], timeout=RPC_TIMEOUT)
+            return {**settled, 'document_hash': document_hash, 'ipfs_cid': ipfs_cid}
         
-        return {
+        # Get contract information in one round trip
+        (
+            signatures,
+            is_fully_signed,
+            required_signers,
+            progress,
+            status,
+            document_hash,
+            ipfs_cid
+        ) = batch_call(session, config.rpc_url, [
+            (contract, 'getSignatures', ()),
+            (contract, 'isFullySigned', ()),
+            (contract, 'getRequiredSigners', ()),
+            (contract, 'getSigningProgress', ()),
+            (contract, 'status', ()),
+            (contract, 'documentHash', ()),
+            (contract, 'ipfsCid', ())
+        ], timeout=RPC_TIMEOUT)
+        
+        signing_state = {
             'signatures': signatures,
             'is_fully_signed': is_fully_signed,
             'required_signers': required_signers,
             'signed_count': progress[0],
             'total_signers': progress[1],
-            'status': status_names[status] if status < len(status_names) else "UNKNOWN",
-            'document_hash': document_hash,
-            'ipfs_cid': ipfs_cid
+            'status': STATUS_NAMES[status] if status < len(STATUS_NAMES) else "UNKNOWN"
         }
+        if signing_state['status'] in FINAL_STATUSES:
+            settled_state.put(contract.address, signing_state)
+        
+        return {**signing_state, 'document_hash': document_hash, 'ipfs_cid': ipfs_cid}
         
     except Exception as e:
         logger.error(f"Error getting contract status: {e}")
         raise
 
-def get_user_contracts(user_address: str) -> List[Dict]:
-    """Get all contracts created by a user"""
+@st.cache_data(ttl=10, show_spinner=False)
+def get_contract_status(contract_address: str) -> Dict:
+    """Get the status of a signing contract (cached for 10 seconds)"""
+    return fetch_contract_status(contract_address)
+
+class StatusPoller:
+    """Refreshes watched contract statuses on a background thread
+    
+    Reruns read the latest snapshot instead of blocking on RPCs. Contracts that
+    haven't been viewed for WATCH_EXPIRY seconds stop being polled. The RPC
+    session, settled state and contract instances are passed in because the
+    polling thread has no script run context to call st.cache_resource
+    functions from.
+    """
+    WATCH_EXPIRY = 60
+    THREAD_NAME = "status-poller"
+    
+    def __init__(
+        self,
+        session: requests.Session,
+        settled_state: SettledSigningState,
+        instances: ContractInstances,
+        interval: float = 5
+    ):
+        self.session = session
+        self.settled_state = settled_state
+        self.instances = instances
+        self.interval = interval
+        self.snapshots: Dict[str, Dict] = {}
+        self.last_viewed: Dict[str, float] = {}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=self.THREAD_NAME, daemon=True)
+        self.thread.poller = self
+        self.thread.start()
+    
+    def stop(self) -> None:
+        """Stop the polling thread after its current cycle"""
+        self.stop_event.set()
+    
+    def snapshot(self, contract_address: str) -> Optional[Dict]:
+        """Get the latest polled status, or None if the contract isn't watched yet"""
+        with self.lock:
+            if contract_address not in self.snapshots:
+                return None
+            self.last_viewed[contract_address] = time.time()
+            return self.snapshots[contract_address]
+    
+    def watch(self, contract_address: str, status_info: Dict) -> None:
+        """Start polling a contract, seeded with a freshly fetched status"""
+        with self.lock:
+            self.snapshots[contract_address] = status_info
+            self.last_viewed[contract_address] = time.time()
+    
+    def forget(self, contract_address: str) -> None:
+        """Drop a contract's snapshot, e.g. after it has been signed"""
+        with self.lock:
+            self._drop(contract_address)
+    
+    def _drop(self, contract_address: str) -> None:
+        self.snapshots.pop(contract_address, None)
+        self.last_viewed.pop(contract_address, None)
+    
+    def run(self) -> None:
+        """Poll loop of the background thread"""
+        while not self.stop_event.wait(self.interval):
+            with self.lock:
+                now = time.time()
+                for address in [a for a, t in self.last_viewed.items() if now - t > self.WATCH_EXPIRY]:
+                    self._drop(address)
+                addresses = list(self.last_viewed)
+            
+            for address in addresses:
+                if self.stop_event.is_set():
+                    return
+                try:
+                    status_info = fetch_contract_status(address, self.session, self.settled_state, self.instances)
+                except Exception as e:
+                    logger.warning(f"Error polling status for contract {address}: {e}")
+                    continue
+                with self.lock:
+                    if address in self.last_viewed:
+                        self.snapshots[address] = status_info
+
+@st.cache_resource
+def status_poller() -> StatusPoller:
+    """Process-wide contract status poller, started on first use"""
+    # A cleared cache or an edited app.py builds a new poller; stop any still running
+    for thread in threading.enumerate():
+        if thread.name == StatusPoller.THREAD_NAME and hasattr(thread, 'poller'):
+            thread.poller.stop()
+    return StatusPoller(rpc_session(), settled_signing_state(), contract_instances())
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_user_contracts(user_address: str) -> List[Dict]:
+    """Load all contracts created by a user (cached for 30 seconds; errors are not cached)"""
     try:
         if not config.factory_address:
             return []
         
-        factory = w3.eth.contract(address=config.factory_address, abi=FACTORY_ABI)
+        instances = contract_instances()
+        factory = instances.factory
         contract_addresses = factory.functions.getContractsByInitiator(user_address).call()
         
-        contracts = []
+        # Read info, status and progress for every contract in one aggregated call
+        calls = []
         for address in contract_addresses:
-            try:
-                contract_info = factory.functions.getContractInfo(address).call()
-                status_info = get_contract_status(address)
-                
-                contracts.append({
-                    'address': address,
-                    'title': contract_info[6],  # title field
-                    'document_hash': contract_info[1],  # documentHash field
-                    'ipfs_cid': contract_info[2],  # ipfsCid field
-                    'created_at': contract_info[4],  # createdAt field
-                    'is_active': contract_info[5],  # isActive field
-                    'status': status_info['status'],
-                    'progress': f"{status_info['signed_count']}/{status_info['total_signers']}"
-                })
-            except Exception as e:
-                logger.warning(f"Error getting info for contract {address}: {e}")
+            contract = instances.signer(address)
+            calls.extend([
+                (factory, 'getContractInfo', (address,)),
+                (contract, 'status', ()),
+                (contract, 'getSigningProgress', ())
+            ])
+        results = aggregate_calls(calls)
+        
+        contracts = []
+        for i, address in enumerate(contract_addresses):
+            contract_info, status, progress = results[3 * i:3 * i + 3]
+            if contract_info is None or status is None or progress is None:
+                logger.warning(f"Error getting info for contract {address}")
                 continue
+            
+            contracts.append({
+                'address': address,
+                'title': contract_info[6],  # title field
+                'document_hash': contract_info[1],  # documentHash field
+                'ipfs_cid': contract_info[2],  # ipfsCid field
+                'created_at': contract_info[4],  # createdAt field
+                'is_active': contract_info[5],  # isActive field
+                'status': STATUS_NAMES[status] if status < len(STATUS_NAMES) else "UNKNOWN",
+                'progress': f"{progress[0]}/{progress[1]}"
+            })
         
         return contracts
         
     except Exception as e:
-        logger.error(f"Error getting user contracts: {e}")
+        logger.error(f"Error loading user contracts: {e}")
+        raise
+
+def get_user_contracts(user_address: str) -> List[Dict]:
+    """Get all contracts created by a user"""
+    try:
+        return load_user_contracts(user_address)
+    except Exception:
         return []
 
 # Streamlit UI
@@ -341,23 +699,31 @@ with tab1:
             try:
                 with st.spinner("Creating contract..."):
                     # Process file
-                    file_bytes = uploaded_file.read()
-                    document_hash = hash_document(file_bytes)
-                    ipfs_cid = upload_to_ipfs(file_bytes, uploaded_file.name)
+                    document_hash, ipfs_cid = hash_and_cid(uploaded_file)
                     
-                    # Get initiator address
-                    initiator_address = Account.from_key(initiator_key).address
+                    # Get initiator account
+                    initiator = Account.from_key(initiator_key)
+                    initiator_address = initiator.address
                     
-                    # Filter out empty signers and add initiator
-                    required_signers = [initiator_address] + [s for s in st.session_state.signers if s.strip()]
-                    required_signers = list(dict.fromkeys(required_signers))  # Remove duplicates
+                    # Filter out empty signers, add initiator and remove duplicates
+                    # (checksummed so differently-cased entries count as the same signer)
+                    required_signers = []
+                    seen_signers = set()
+                    for signer in [initiator_address, *st.session_state.signers]:
+                        signer = signer.strip()
+                        if not signer:
+                            continue
+                        signer = Web3.to_checksum_address(signer)
+                        if signer not in seen_signers:
+                            seen_signers.add(signer)
+                            required_signers.append(signer)
                     
                     # Create contract
                     contract_address = create_signing_contract(
                         document_hash=document_hash,
                         ipfs_cid=ipfs_cid,
                         required_signers=required_signers,
-                        private_key=initiator_key,
+                        account=initiator,
                         title=title,
                         description=description,
                         sequential_signing=sequential_signing
@@ -370,6 +736,7 @@ with tab1:
                     
                     # Store in session for other tabs
                     st.session_state.last_contract = contract_address
+                    load_user_contracts.clear()
                     
             except Exception as e:
                 st.error(f"❌ Error creating contract: {str(e)}")
@@ -403,15 +770,20 @@ with tab2:
     with col2:
         if contract_address:
             try:
-                status_info = get_contract_status(contract_address)
+                # Read the background poller's snapshot; only fetch inline the first time
+                status_info = status_poller().snapshot(contract_address)
+                if status_info is None:
+                    status_info = get_contract_status(contract_address)
+                    status_poller().watch(contract_address, status_info)
                 st.subheader("📊 Contract Status")
                 st.metric("Status", status_info['status'])
                 st.metric("Progress", status_info['progress'])
                 
                 if status_info['required_signers']:
                     st.subheader("👥 Required Signers")
+                    signed_set = {sig[0].lower() for sig in status_info['signatures']}
                     for i, signer in enumerate(status_info['required_signers']):
-                        signed = any(sig[0].lower() == signer.lower() for sig in status_info['signatures'])
+                        signed = signer.lower() in signed_set
                         icon = "✅" if signed else "⏳"
                         st.write(f"{icon} {signer[:10]}...{signer[-8:]}")
                         
@@ -426,13 +798,22 @@ with tab2:
         else:
             try:
                 with st.spinner("Signing document..."):
-                    tx_hash = sign_document(contract_address, signer_key, signature_metadata)
+                    signer = Account.from_key(signer_key)
+                    tx_hash = sign_document(contract_address, signer, signature_metadata)
+                st.info(f"**Transaction Hash:** `{tx_hash}`")
+                
+                with st.spinner("Waiting for confirmation..."):
+                    confirmed = confirm_transaction(tx_hash, signer.address)
+                
+                if confirmed:
                     st.success(f"🎉 Document signed successfully!")
-                    st.info(f"**Transaction Hash:** `{tx_hash}`")
-                    
                     # Refresh status
-                    time.sleep(2)  # Wait for transaction to be mined
+                    get_contract_status.clear()
+                    load_user_contracts.clear()
+                    status_poller().forget(contract_address)
                     st.rerun()
+                else:
+                    st.error("❌ Signing transaction reverted")
                     
             except Exception as e:
                 st.error(f"❌ Error signing document: {str(e)}")
@@ -486,8 +867,9 @@ with tab3:
                 
                 # Required signers
                 st.subheader("👥 Required Signers")
+                signed_set = {sig[0].lower() for sig in status_info['signatures']}
                 for signer in status_info['required_signers']:
-                    signed = any(sig[0].lower() == signer.lower() for sig in status_info['signatures'])
+                    signed = signer.lower() in signed_set
                     icon = "✅" if signed else "⏳"
                     status_text = "Signed" if signed else "Pending"
                     st.write(f"{icon} `{signer}` - {status_text}")
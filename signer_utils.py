@@ -0,0 +1,203 @@
+"""Helpers of the Streamlit app that don't depend on Streamlit or a live node
+
+Kept out of app.py, which renders the UI on import, so they can be tested.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple, BinaryIO, Callable
+
+import requests
+from eth_abi import decode
+from web3 import Web3
+from web3.exceptions import MismatchedABI, LogTopicError
+
+HASH_CHUNK_SIZE = 256 * 1024  # Read size for streaming document hashes
+
+def iter_chunks(file_obj: BinaryIO):
+    """Yield HASH_CHUNK_SIZE chunks of a stream, as zero-copy views for in-memory files"""
+    if hasattr(file_obj, 'getbuffer'):
+        # Streamlit uploads are BytesIO objects; slice their buffer instead of copying it out
+        with file_obj.getbuffer() as buffer:
+            for offset in range(file_obj.tell(), len(buffer), HASH_CHUNK_SIZE):
+                with buffer[offset:offset + HASH_CHUNK_SIZE] as chunk:
+                    yield chunk
+            # Leave the stream at EOF, as the read() path does
+            file_obj.seek(len(buffer))
+    else:
+        while chunk := file_obj.read(HASH_CHUNK_SIZE):
+            yield chunk
+
+def hash_and_cid(file_obj: BinaryIO) -> Tuple[str, str]:
+    """Generate the SHA-256 document hash and IPFS CID in a single pass over the stream"""
+    sha256 = hashlib.sha256()
+    md5 = hashlib.md5()
+    for chunk in iter_chunks(file_obj):
+        sha256.update(chunk)
+        md5.update(chunk)
+
+    # In a real implementation, you would upload to IPFS via NFT.Storage
+    # For now, derive a mock CID from the same read
+    return '0x' + sha256.hexdigest(), f"Qm{md5.hexdigest()[:44]}"
+
+def abi_type_string(param: Dict) -> str:
+    """Get the canonical ABI type string for an ABI input/output entry"""
+    if param['type'].startswith('tuple'):
+        components = ','.join(abi_type_string(c) for c in param['components'])
+        return f"({components}){param['type'][len('tuple'):]}"
+    return param['type']
+
+def normalize_abi_value(param: Dict, value):
+    """Shape a decoded ABI value the way web3's .call() returns it"""
+    abi_type = param['type']
+    if abi_type.endswith(']'):
+        item_param = dict(param, type=abi_type[:abi_type.rindex('[')])
+        return [normalize_abi_value(item_param, v) for v in value]
+    if abi_type == 'tuple':
+        return tuple(normalize_abi_value(c, v) for c, v in zip(param['components'], value))
+    if abi_type == 'address':
+        return Web3.to_checksum_address(value)
+    return value
+
+def call_outputs(calls: List[Tuple]) -> List[List[Dict]]:
+    """Get the ABI outputs of each (contract, fn_name, args) call, resolving each function once"""
+    outputs_by_function = {}
+    for contract, fn_name, args in calls:
+        key = (contract.address, fn_name)
+        if key not in outputs_by_function:
+            outputs_by_function[key] = contract.get_function_by_name(fn_name).abi['outputs']
+    return [outputs_by_function[(contract.address, fn_name)] for contract, fn_name, args in calls]
+
+def decode_call_result(outputs: List[Dict], data: bytes):
+    """Decode the raw return data of a contract function call"""
+    values = decode([abi_type_string(o) for o in outputs], data)
+    values = [normalize_abi_value(o, v) for o, v in zip(outputs, values)]
+    return values[0] if len(values) == 1 else values
+
+def batch_call(
+    session: requests.Session,
+    rpc_url: str,
+    calls: List[Tuple],
+    allow_failure: bool = False,
+    timeout: float = 10
+) -> List:
+    """Execute (contract, fn_name, args) read calls in a single JSON-RPC batch request
+
+    With allow_failure, a failed call yields None instead of raising.
+    """
+    payload = [
+        {
+            'jsonrpc': '2.0',
+            'id': i,
+            'method': 'eth_call',
+            'params': [
+                {'to': contract.address, 'data': contract.encodeABI(fn_name=fn_name, args=args)},
+                'latest'
+            ]
+        }
+        for i, (contract, fn_name, args) in enumerate(calls)
+    ]
+
+    response = session.post(rpc_url, json=payload, timeout=timeout)
+    response.raise_for_status()
+    batch_response = response.json()
+    if not isinstance(batch_response, list):
+        # Nodes that reject or rate-limit batches answer with a single error object
+        error = batch_response.get('error', {}) if isinstance(batch_response, dict) else {}
+        raise ValueError(f"RPC node rejected batch request: {error.get('message', batch_response)}")
+    # Batch responses may come back in any order
+    responses = {r.get('id'): r for r in batch_response}
+
+    results = []
+    for i, ((contract, fn_name, args), outputs) in enumerate(zip(calls, call_outputs(calls))):
+        rpc_response = responses.get(i)
+        if rpc_response is None:
+            raise ValueError(f"Missing batch response for {fn_name}")
+        if 'error' in rpc_response:
+            if allow_failure:
+                results.append(None)
+                continue
+            raise ValueError(f"{fn_name} call failed: {rpc_response['error'].get('message')}")
+        results.append(decode_call_result(outputs, Web3.to_bytes(hexstr=rpc_response['result'])))
+    return results
+
+class NonceTracker:
+    """Next nonce per sender address, only asking the node on first use
+
+    get_transaction_count is called with a sender address and should return its
+    'pending' transaction count.
+    """
+
+    def __init__(self, get_transaction_count: Callable[[str], int]):
+        self.get_transaction_count = get_transaction_count
+        self.nonces: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def next(self, address: str) -> int:
+        """Get the next nonce for an address and reserve it"""
+        with self.lock:
+            if address not in self.nonces:
+                self.nonces[address] = self.get_transaction_count(address)
+            nonce = self.nonces[address]
+            self.nonces[address] += 1
+            return nonce
+
+    def reset(self, address: str) -> None:
+        """Forget the cached nonce so the next transaction re-fetches it from the node"""
+        with self.lock:
+            self.nonces.pop(address, None)
+
+def created_contract_address(factory, logs: List, contract_created_topic: bytes) -> Optional[str]:
+    """Get the new contract's address from the ContractCreated event among receipt logs"""
+    for log in logs:
+        if not log['topics'] or log['topics'][0] != contract_created_topic:
+            continue
+        try:
+            return factory.events.ContractCreated().process_log(log).args.contractAddress
+        except (MismatchedABI, LogTopicError):
+            continue
+    return None
+
+def is_nonce_too_low(error: Exception) -> bool:
+    """Check whether a send failed because its nonce was already used on chain"""
+    # web3 raises the node's error dict as a ValueError; geth says "nonce too low: ...",
+    # Hardhat "Nonce too low. Expected nonce to be ..."
+    return 'nonce too low' in str(error).lower()
+
+def is_method_rejection(error: Dict) -> bool:
+    """Check whether an RPC error rejects the method itself rather than the transaction"""
+    if error.get('code') == -32601:  # Method not found
+        return True
+    # Some providers answer unknown methods with a generic code and a descriptive message
+    message = str(error.get('message', '')).lower()
+    return 'method' in message and any(
+        phrase in message for phrase in ('not found', 'not supported', 'does not exist', 'not available')
+    )
+
+class SettledSigningState:
+    """Signing fields of completed/cancelled contracts, keyed by contract address
+
+    Once a contract is completed or cancelled its signers, signatures and status
+    can no longer change. The owner can still update documentHash and ipfsCid,
+    so those are never cached. Holds at most maxsize contracts, evicting the
+    least recently used.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, contract_address: str) -> Optional[Dict]:
+        with self.lock:
+            signing_state = self.entries.get(contract_address)
+            if signing_state is not None:
+                self.entries.move_to_end(contract_address)
+            return signing_state
+
+    def put(self, contract_address: str, signing_state: Dict) -> None:
+        with self.lock:
+            self.entries[contract_address] = signing_state
+            self.entries.move_to_end(contract_address)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
@@ -0,0 +1,299 @@
+import hashlib
+import io
+
+import pytest
+from eth_abi import encode
+from eth_utils import event_abi_to_log_topic
+from web3 import Web3
+from web3.datastructures import AttributeDict
+from web3._utils.method_formatters import receipt_formatter
+
+from signer_utils import (
+    HASH_CHUNK_SIZE,
+    iter_chunks,
+    hash_and_cid,
+    abi_type_string,
+    normalize_abi_value,
+    call_outputs,
+    decode_call_result,
+    batch_call,
+    NonceTracker,
+    is_nonce_too_low,
+    is_method_rejection,
+    created_contract_address,
+    SettledSigningState
+)
+
+SIGNATURE_OUTPUT = {
+    'name': '',
+    'type': 'tuple[]',
+    'components': [
+        {'name': 'signer', 'type': 'address'},
+        {'name': 'timestamp', 'type': 'uint256'},
+        {'name': 'documentVersion', 'type': 'bytes32'},
+        {'name': 'metadata', 'type': 'string'}
+    ]
+}
+
+SIGNER_ABI = [
+    {'name': 'getSignatures', 'type': 'function', 'stateMutability': 'view',
+     'inputs': [], 'outputs': [SIGNATURE_OUTPUT]},
+    {'name': 'status', 'type': 'function', 'stateMutability': 'view',
+     'inputs': [], 'outputs': [{'name': '', 'type': 'uint8'}]},
+    {'name': 'ipfsCid', 'type': 'function', 'stateMutability': 'view',
+     'inputs': [], 'outputs': [{'name': '', 'type': 'string'}]},
+    {'name': 'getSigningProgress', 'type': 'function', 'stateMutability': 'view',
+     'inputs': [], 'outputs': [{'name': 'signed', 'type': 'uint256'}, {'name': 'total', 'type': 'uint256'}]}
+]
+
+CONTRACT_CREATED_EVENT = {
+    'name': 'ContractCreated',
+    'type': 'event',
+    'anonymous': False,
+    'inputs': [
+        {'name': 'contractAddress', 'type': 'address', 'indexed': True},
+        {'name': 'documentHash', 'type': 'bytes32', 'indexed': True},
+        {'name': 'initiator', 'type': 'address', 'indexed': True},
+        {'name': 'ipfsCid', 'type': 'string', 'indexed': False},
+        {'name': 'title', 'type': 'string', 'indexed': False}
+    ]
+}
+
+FACTORY_ADDRESS = '0xe7f1725E7734CE288F8367e1Bb143E90bb3F0512'
+CONTRACT_ADDRESS = '0x5FbDB2315678afecb367f032d93F642f64180aa3'
+SIGNER_ADDRESS = '0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266'
+RPC_URL = 'http://127.0.0.1:8545'
+
+@pytest.fixture
+def contract():
+    return Web3().eth.contract(address=CONTRACT_ADDRESS, abi=SIGNER_ABI)
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+class FakeSession:
+    """Answers a batch POST with a canned body, recording the request"""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.requests = []
+
+    def post(self, url, json, timeout):
+        self.requests.append(json)
+        return FakeResponse(self.respond(json))
+
+def rpc_result(request_id, abi_types, values):
+    return {'jsonrpc': '2.0', 'id': request_id, 'result': Web3.to_hex(encode(abi_types, values))}
+
+def test_abi_type_string_expands_tuples():
+    assert abi_type_string({'type': 'uint8'}) == 'uint8'
+    assert abi_type_string(SIGNATURE_OUTPUT) == '(address,uint256,bytes32,string)[]'
+
+def test_decode_call_result_decodes_tuple_array_with_checksummed_addresses():
+    version = b'\x01' * 32
+    data = encode(['(address,uint256,bytes32,string)[]'], [[(SIGNER_ADDRESS.lower(), 42, version, 'ok')]])
+
+    assert decode_call_result([SIGNATURE_OUTPUT], data) == [(SIGNER_ADDRESS, 42, version, 'ok')]
+
+def test_decode_call_result_returns_a_list_for_multiple_outputs():
+    outputs = SIGNER_ABI[3]['outputs']
+
+    assert decode_call_result(outputs, encode(['uint256', 'uint256'], [1, 3])) == [1, 3]
+
+def test_normalize_abi_value_checksums_address_arrays():
+    param = {'type': 'address[]'}
+
+    assert normalize_abi_value(param, [SIGNER_ADDRESS.lower()]) == [SIGNER_ADDRESS]
+
+def test_call_outputs_resolves_each_function_once(contract, monkeypatch):
+    lookups = []
+    get_function_by_name = contract.get_function_by_name
+    monkeypatch.setattr(contract, 'get_function_by_name', lambda name: lookups.append(name) or get_function_by_name(name))
+
+    outputs = call_outputs([(contract, 'status', ()), (contract, 'ipfsCid', ()), (contract, 'status', ())])
+
+    assert lookups == ['status', 'ipfsCid']
+    assert outputs[0] == outputs[2] == [{'name': '', 'type': 'uint8'}]
+
+def test_batch_call_matches_out_of_order_responses_by_id(contract):
+    session = FakeSession(lambda payload: [
+        rpc_result(1, ['string'], ['QmCid']),
+        rpc_result(0, ['uint8'], [2])
+    ])
+
+    results = batch_call(session, RPC_URL, [(contract, 'status', ()), (contract, 'ipfsCid', ())])
+
+    assert results == [2, 'QmCid']
+    assert [request['method'] for request in session.requests[0]] == ['eth_call', 'eth_call']
+
+def test_batch_call_raises_on_a_non_list_error_response(contract):
+    session = FakeSession(lambda payload: {'jsonrpc': '2.0', 'id': None, 'error': {'code': -32600, 'message': 'batch not allowed'}})
+
+    with pytest.raises(ValueError, match='batch not allowed'):
+        batch_call(session, RPC_URL, [(contract, 'status', ())])
+
+def test_batch_call_raises_on_a_failed_call(contract):
+    session = FakeSession(lambda payload: [{'jsonrpc': '2.0', 'id': 0, 'error': {'code': 3, 'message': 'execution reverted'}}])
+
+    with pytest.raises(ValueError, match='status call failed: execution reverted'):
+        batch_call(session, RPC_URL, [(contract, 'status', ())])
+
+def test_batch_call_allow_failure_yields_none(contract):
+    session = FakeSession(lambda payload: [
+        {'jsonrpc': '2.0', 'id': 0, 'error': {'code': 3, 'message': 'execution reverted'}},
+        rpc_result(1, ['string'], ['QmCid'])
+    ])
+
+    results = batch_call(session, RPC_URL, [(contract, 'status', ()), (contract, 'ipfsCid', ())], allow_failure=True)
+
+    assert results == [None, 'QmCid']
+
+def test_batch_call_raises_on_a_missing_response(contract):
+    session = FakeSession(lambda payload: [rpc_result(0, ['uint8'], [1])])
+
+    with pytest.raises(ValueError, match='Missing batch response for ipfsCid'):
+        batch_call(session, RPC_URL, [(contract, 'status', ()), (contract, 'ipfsCid', ())])
+
+class ReadOnlyStream(io.RawIOBase):
+    """A stream without getbuffer(), like an open file"""
+
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self.data.read(size)
+
+def test_hash_and_cid_matches_between_buffer_and_read_paths():
+    data = bytes(range(256)) * (HASH_CHUNK_SIZE // 128 + 3)
+
+    buffered = hash_and_cid(io.BytesIO(data))
+    streamed = hash_and_cid(ReadOnlyStream(data))
+
+    assert buffered == streamed
+    assert buffered[0] == '0x' + hashlib.sha256(data).hexdigest()
+    assert buffered[1] == 'Qm' + hashlib.md5(data).hexdigest()[:44]
+
+def test_iter_chunks_starts_at_the_current_position_and_leaves_stream_at_eof():
+    data = b'x' * (HASH_CHUNK_SIZE + 10)
+    stream = io.BytesIO(data)
+    stream.seek(5)
+
+    chunks = [bytes(chunk) for chunk in iter_chunks(stream)]
+
+    assert [len(chunk) for chunk in chunks] == [HASH_CHUNK_SIZE, 5]
+    assert stream.tell() == len(data)
+    assert stream.read() == b''
+
+def test_settled_signing_state_evicts_least_recently_used():
+    state = SettledSigningState(maxsize=2)
+    state.put('a', {'status': 'COMPLETED'})
+    state.put('b', {'status': 'CANCELLED'})
+    state.get('a')
+    state.put('c', {'status': 'COMPLETED'})
+
+    assert state.get('b') is None
+    assert state.get('a') == {'status': 'COMPLETED'}
+    assert state.get('c') == {'status': 'COMPLETED'}
+
+def test_nonce_tracker_fetches_once_and_refetches_after_reset():
+    counts = iter([7, 3])
+    fetched = []
+    tracker = NonceTracker(lambda address: fetched.append(address) or next(counts))
+
+    assert [tracker.next(SIGNER_ADDRESS) for _ in range(3)] == [7, 8, 9]
+    tracker.reset(SIGNER_ADDRESS)
+    assert tracker.next(SIGNER_ADDRESS) == 3
+    assert fetched == [SIGNER_ADDRESS, SIGNER_ADDRESS]
+
+@pytest.mark.parametrize('error, expected', [
+    (ValueError({'code': -32000, 'message': 'nonce too low: next nonce 5, tx nonce 3'}), True),
+    (ValueError('Transaction failed: Nonce too low. Expected nonce to be 5 but got 3.'), True),
+    (ValueError({'code': -32000, 'message': 'replacement transaction underpriced'}), False)
+])
+def test_is_nonce_too_low(error, expected):
+    assert is_nonce_too_low(error) is expected
+
+@pytest.mark.parametrize('error', [
+    {'code': -32601, 'message': 'the method eth_sendRawTransactionSync does not exist/is not available'},
+    {'code': -32000, 'message': 'Method not found'},
+    {'message': 'method eth_sendRawTransactionSync not supported'}
+])
+def test_is_method_rejection_detects_unknown_methods(error):
+    assert is_method_rejection(error)
+
+@pytest.mark.parametrize('error', [
+    {'code': -32000, 'message': 'nonce too low'},
+    {'code': -32003, 'message': 'insufficient funds for gas * price + value'},
+    {'code': 3, 'message': 'execution reverted'},
+    {'code': -32602, 'message': 'invalid argument 0: json: cannot unmarshal hex string'},
+    {'code': -32600, 'message': 'invalid request'}
+])
+def test_is_method_rejection_ignores_transaction_errors(error):
+    assert not is_method_rejection(error)
+
+def rpc_receipt(logs):
+    """A transaction receipt as eth_sendRawTransactionSync returns it"""
+    return {
+        'transactionHash': '0x' + 'ab' * 32,
+        'transactionIndex': '0x0',
+        'blockHash': '0x' + 'cd' * 32,
+        'blockNumber': '0x2',
+        'from': SIGNER_ADDRESS.lower(),
+        'to': FACTORY_ADDRESS.lower(),
+        'cumulativeGasUsed': '0x1e8480',
+        'gasUsed': '0x1e8480',
+        'effectiveGasPrice': '0x4a817c800',
+        'contractAddress': None,
+        'logsBloom': '0x' + '00' * 256,
+        'status': '0x1',
+        'type': '0x0',
+        'logs': logs
+    }
+
+def rpc_log(address, topics, data):
+    return {
+        'address': address,
+        'topics': topics,
+        'data': data,
+        'blockHash': '0x' + 'cd' * 32,
+        'blockNumber': '0x2',
+        'transactionHash': '0x' + 'ab' * 32,
+        'transactionIndex': '0x0',
+        'logIndex': hex(len(topics)),
+        'removed': False
+    }
+
+def test_created_contract_address_decodes_a_formatted_receipt_log():
+    factory = Web3().eth.contract(address=FACTORY_ADDRESS, abi=[CONTRACT_CREATED_EVENT])
+    topic = event_abi_to_log_topic(CONTRACT_CREATED_EVENT)
+    document_hash = '0x' + '11' * 32
+    transfer_log = rpc_log(CONTRACT_ADDRESS.lower(), ['0x' + 'ee' * 32], '0x')
+    created_log = rpc_log(
+        FACTORY_ADDRESS.lower(),
+        [
+            Web3.to_hex(topic),
+            '0x' + CONTRACT_ADDRESS[2:].lower().rjust(64, '0'),
+            document_hash,
+            '0x' + SIGNER_ADDRESS[2:].lower().rjust(64, '0')
+        ],
+        Web3.to_hex(encode(['string', 'string'], ['QmCid', 'Legal Contract']))
+    )
+    receipt = AttributeDict.recursive(receipt_formatter(rpc_receipt([transfer_log, created_log])))
+
+    assert created_contract_address(factory, receipt.logs, topic) == CONTRACT_ADDRESS
+
+def test_created_contract_address_is_none_without_the_event():
+    factory = Web3().eth.contract(address=FACTORY_ADDRESS, abi=[CONTRACT_CREATED_EVENT])
+    receipt = AttributeDict.recursive(receipt_formatter(rpc_receipt([])))
+
+    assert created_contract_address(factory, receipt.logs, event_abi_to_log_topic(CONTRACT_CREATED_EVENT)) is None